@@ -51,6 +51,12 @@ def run(
         "-u",
         help="OpenAI-compatible base URL for local models (e.g. http://localhost:11434/v1). Env: OPENAI_BASE_URL.",
     ),
+    max_concurrent: int = typer.Option(
+        0,
+        "--max-concurrent",
+        "-j",
+        help="Maximum evaluations to run in parallel (default: min(8, CPU count)). Env: GSKILL_MAX_CONCURRENT.",
+    ),
 ) -> None:
     """Run the gskill pipeline: optimize a SKILL.md for the given repository."""
     from src.pipeline import run as _run
@@ -63,6 +69,7 @@ def run(
         agent_model=agent_model or None,
         skill_model=skill_model or None,
         base_url=base_url or None,
+        max_concurrent=max_concurrent or None,
     )
 
 
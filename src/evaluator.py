@@ -1,14 +1,17 @@
 """Mini-SWE-Agent evaluator for GEPA multi-task search."""
 
+import asyncio
+import atexit
 import os
+import re
 import subprocess
 import tempfile
-import textwrap
-from pathlib import Path
+import threading
+from collections import deque
+from collections.abc import Iterable
 from typing import Callable
 
 import gepa.optimize_anything as oa
-import yaml
 from minisweagent.agents import get_agent
 from minisweagent.config import builtin_config_dir, get_config_from_spec
 from minisweagent.models import get_model
@@ -20,6 +23,13 @@ from minisweagent.utils.serialize import recursive_merge
 
 _SWEBENCH_CONFIG = builtin_config_dir / "benchmarks" / "swebench.yaml"
 
+# Patch and trajectory files are short-lived scratch data; keep them on tmpfs
+# when the host has one so GEPA loops never touch disk.
+_TMPDIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+# Parsed once at import; each evaluation only overlays the candidate skill.
+_BASE_CONFIG = get_config_from_spec(str(_SWEBENCH_CONFIG))
+
 # Base system prompt that frames the skill content
 _SYSTEM_PREFIX = (
     "You are a helpful assistant that can interact with a computer shell "
@@ -27,21 +37,265 @@ _SYSTEM_PREFIX = (
     "# Repository-Specific Knowledge\n\n"
 )
 
+# File paths on the ---/+++ and rename/copy header lines of a git diff.
+_DIFF_PATH_RE = re.compile(
+    r"^(?:(?:---|\+\+\+) (?:[ab]/)?|(?:rename|copy) (?:from|to) )"
+    r"(?P<path>[^\t\n]+)",
+    re.MULTILINE,
+)
+# Renames, mode changes and binary files have no ---/+++ lines, only this header.
+_DIFF_GIT_RE = re.compile(r"^diff --git a/(?P<old>\S+) b/(?P<new>\S+)$", re.MULTILINE)
+# Documentation files can't change pytest outcomes unless they are test data.
+_DOC_SUFFIX_RE = re.compile(r"\.(?:md|rst|txt|adoc)$", re.IGNORECASE)
+_TEST_PATH_RE = re.compile(r"(?:^|/)(?:tests?|testing)(?:/|$)|(?:^|/)test_[^/]*$")
+
+
+def _patch_touches_code(patch: str) -> bool:
+    """Return whether the patch could affect test outcomes.
 
-def _write_skill_config(skill: str) -> Path:
-    """Write a mini config YAML that overrides agent.system_template with the skill."""
-    system_template = _SYSTEM_PREFIX + skill
-    config = {"agent": {"system_template": system_template}}
-    tmp = tempfile.NamedTemporaryFile(
-        mode="w", suffix=".yaml", delete=False, prefix="gskill_skill_"
+    False when the diff names no files or only touches documentation outside
+    test directories, so the Docker test run can be skipped.
+    """
+    paths = {
+        m["path"].strip()
+        for m in _DIFF_PATH_RE.finditer(patch)
+        if m["path"].strip() != "/dev/null"
+    }
+    for m in _DIFF_GIT_RE.finditer(patch):
+        paths.update((m["old"], m["new"]))
+    return any(
+        not _DOC_SUFFIX_RE.search(path) or _TEST_PATH_RE.search(path) for path in paths
     )
-    yaml.dump(config, tmp, default_flow_style=False, allow_unicode=True)
-    tmp.close()
-    return Path(tmp.name)
+
+
+# Warm test containers, reused across evaluations instead of paying a
+# `docker run --rm` cold start per patch. Each container is checked out by one
+# evaluation at a time and reset to a clean /testbed before it is returned.
+# Pooled containers carry this label so any leaked by a hard crash can be
+# found with `docker ps --filter label=gskill.pool=1`.
+_POOL_LABEL = "gskill.pool=1"
+_CONTAINER_POOL: dict[str, list[str]] = {}
+_LIVE_CONTAINERS: set[str] = set()
+_XDIST_CONTAINERS: set[str] = set()
+_CONTAINER_LOCK = threading.Lock()
+
+# Covers a cold image pull, which is not the candidate's fault.
+_CONTAINER_START_TIMEOUT = 600
+
+_RESET_CMD = "cd /testbed && git checkout -q -- . && git clean -fdq"
+
+_TEST_CMD_TEMPLATE = (
+    "cd /testbed\n"
+    "git apply /tmp/solution.patch 2>/dev/null"
+    " || patch -p1 < /tmp/solution.patch 2>/dev/null\n"
+    "python -m pytest {test_args} {pytest_flags} --tb=no -q 2>&1\n"
+)
+
+# Installs pytest-xdist once per container, pinned to the image's pytest so the
+# resolver cannot upgrade it, and rolls back if the plugin fails to load.
+_XDIST_BOOTSTRAP_CMD = """\
+python -c "import xdist" 2>/dev/null && exit 0
+pip install -q pytest-xdist "pytest==$(python -c 'import pytest; print(pytest.__version__)')" >/dev/null 2>&1 || exit 1
+python -m pytest --help 2>/dev/null | grep -q -- --numprocesses && exit 0
+pip uninstall -y -q pytest-xdist >/dev/null 2>&1
+exit 1
+"""
+
+
+def _start_container(image_name: str) -> str:
+    """Start a detached, idle container for ``image_name`` and return its id."""
+    result = subprocess.run(
+        [
+            "docker",
+            "run",
+            "-d",
+            "--rm",
+            "--label",
+            _POOL_LABEL,
+            "--entrypoint",
+            "sleep",
+            image_name,
+            "infinity",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=_CONTAINER_START_TIMEOUT,
+    )
+    return result.stdout.strip()
+
+
+def _install_xdist(container_id: str) -> bool:
+    """Make pytest-xdist available in the container; return whether it worked."""
+    try:
+        result = subprocess.run(
+            ["docker", "exec", container_id, "bash", "-c", _XDIST_BOOTSTRAP_CMD],
+            capture_output=True,
+            check=False,
+            timeout=180,
+        )
+    except (subprocess.SubprocessError, OSError):
+        return False
+    return result.returncode == 0
+
+
+def _acquire_container(image_name: str) -> str:
+    """Check out an idle container for ``image_name``, starting one if needed."""
+    with _CONTAINER_LOCK:
+        idle = _CONTAINER_POOL.get(image_name)
+        if idle:
+            return idle.pop()
+    container_id = _start_container(image_name)
+    with _CONTAINER_LOCK:
+        _LIVE_CONTAINERS.add(container_id)
+    if _install_xdist(container_id):
+        with _CONTAINER_LOCK:
+            _XDIST_CONTAINERS.add(container_id)
+    else:
+        oa.log(
+            f"pytest-xdist unavailable for image={image_name}; running tests serially"
+        )
+    return container_id
+
+
+def _release_container(image_name: str, container_id: str) -> None:
+    """Reset ``/testbed`` and return the container to the pool, or discard it."""
+    try:
+        subprocess.run(
+            ["docker", "exec", container_id, "bash", "-c", _RESET_CMD],
+            capture_output=True,
+            check=True,
+            timeout=60,
+        )
+    except (subprocess.SubprocessError, OSError):
+        _discard_container(container_id)
+        return
+    with _CONTAINER_LOCK:
+        _CONTAINER_POOL.setdefault(image_name, []).append(container_id)
+
+
+def _discard_container(container_id: str) -> None:
+    """Force-remove a container that can no longer be trusted."""
+    with _CONTAINER_LOCK:
+        _LIVE_CONTAINERS.discard(container_id)
+        _XDIST_CONTAINERS.discard(container_id)
+    try:
+        subprocess.run(
+            ["docker", "rm", "-f", container_id],
+            capture_output=True,
+            check=False,
+            timeout=60,
+        )
+    except (subprocess.SubprocessError, OSError):
+        pass
+
+
+@atexit.register
+def _cleanup_containers() -> None:
+    """Remove every test container started by this process."""
+    with _CONTAINER_LOCK:
+        container_ids = list(_LIVE_CONTAINERS)
+        _LIVE_CONTAINERS.clear()
+        _XDIST_CONTAINERS.clear()
+        _CONTAINER_POOL.clear()
+    if not container_ids:
+        return
+    try:
+        subprocess.run(
+            ["docker", "rm", "-f", *container_ids],
+            capture_output=True,
+            check=False,
+            timeout=120,
+        )
+    except (subprocess.SubprocessError, OSError):
+        pass
+
+
+async def _pull_images(images: list[str], max_parallel: int) -> list[str]:
+    """Pull ``images`` with at most ``max_parallel`` pulls in flight.
+
+    Returns:
+        The images that could not be pulled.
+    """
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def pull(image: str) -> bool:
+        async with semaphore:
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    "docker",
+                    "pull",
+                    "--quiet",
+                    image,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+            except OSError:
+                return False
+            return await proc.wait() == 0
+
+    results = await asyncio.gather(*(pull(image) for image in images))
+    return [image for image, ok in zip(images, results) if not ok]
+
+
+def prepull_images(tasks: Iterable[dict], max_parallel: int = 4) -> list[str]:
+    """Pull the Docker images for ``tasks`` up front, a few at a time.
+
+    Otherwise the first evaluation per image pays the pull inside its timed
+    agent and test runs. ``max_parallel`` keeps registries from throttling us.
+
+    Returns:
+        The images that could not be pulled; evaluations will retry them lazily.
+    """
+    images = sorted({get_swebench_docker_image_name(task) for task in tasks})
+    if not images:
+        return []
+    return asyncio.run(_pull_images(images, max_parallel))
+
+
+def _run_with_tail(
+    cmd: list[str], timeout: float, max_lines: int = 50
+) -> tuple[int, str, str]:
+    """Run ``cmd`` keeping only the last ``max_lines`` of stdout and stderr.
+
+    Output is drained line by line into bounded deques, so memory stays flat no
+    matter how verbose the command is.
+
+    Returns:
+        Tuple of (returncode, stdout_tail, stderr_tail).
+
+    Raises:
+        subprocess.TimeoutExpired: If the command outlives ``timeout``; the
+            process is killed first.
+    """
+    stdout_tail: deque[str] = deque(maxlen=max_lines)
+    stderr_tail: deque[str] = deque(maxlen=max_lines)
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    ) as proc:
+        readers = [
+            threading.Thread(target=tail.extend, args=(stream,), daemon=True)
+            for tail, stream in ((stdout_tail, proc.stdout), (stderr_tail, proc.stderr))
+        ]
+        for reader in readers:
+            reader.start()
+        try:
+            returncode = proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            raise
+        finally:
+            for reader in readers:
+                reader.join(timeout=5)
+    return returncode, "".join(stdout_tail), "".join(stderr_tail)
 
 
 def _run_tests(instance: dict, patch: str) -> tuple[bool, str]:
-    """Apply the agent's patch and run FAIL_TO_PASS tests in a fresh Docker container.
+    """Apply the agent's patch and run FAIL_TO_PASS tests in a warm Docker container.
 
     Args:
         instance: SWE-smith task dict (must have FAIL_TO_PASS; image resolved via
@@ -63,54 +317,79 @@ def _run_tests(instance: dict, patch: str) -> tuple[bool, str]:
     # Limit to 10 tests to keep evaluation fast
     test_ids = fail_to_pass[:10]
     test_args = " ".join(f'"{t}"' for t in test_ids)
+    test_files = len({t.split("::")[0] for t in test_ids})
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".patch", delete=False) as f:
-        f.write(patch)
-        patch_file = f.name
+    with tempfile.NamedTemporaryFile(
+        mode="w",
+        suffix=".patch",
+        prefix="gskill_patch_",
+        dir=_TMPDIR,
+        delete_on_close=False,
+    ) as patch_tmp:
+        patch_tmp.write(patch)
+        patch_tmp.close()
 
-    test_cmd = textwrap.dedent(f"""\
-        cd /testbed
-        git apply /tmp/solution.patch 2>/dev/null || patch -p1 < /tmp/solution.patch 2>/dev/null
-        python -m pytest {test_args} -x --tb=no -q 2>&1
-    """)
-
-    try:
-        result = subprocess.run(
-            [
-                "docker",
-                "run",
-                "--rm",
-                "-v",
-                f"{patch_file}:/tmp/solution.patch:ro",
-                image_name,
-                "bash",
-                "-c",
-                test_cmd,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=180,
-        )
-        passed = result.returncode == 0
-        stdout_tail = result.stdout[-500:] if result.stdout else ""
-        oa.log(f"Test stdout tail: {stdout_tail}")
-        if not passed:
+        container_id = None
+        try:
+            try:
+                container_id = _acquire_container(image_name)
+            except subprocess.TimeoutExpired:
+                oa.log(
+                    f"Test container start timed out ({_CONTAINER_START_TIMEOUT}s) "
+                    f"for image={image_name}"
+                )
+                return False, "container_start_timeout"
+            # --dist=loadfile keeps each file on one worker, so more workers than
+            # files only adds startup cost. xdist workers can't honour -x across
+            # processes, so a single file stays serial and stops on first failure.
+            n_workers = min(test_files, os.cpu_count() or 1)
+            if container_id in _XDIST_CONTAINERS and n_workers > 1:
+                pytest_flags = f"-n {n_workers} --dist=loadfile"
+            else:
+                pytest_flags = "-x"
+            test_cmd = _TEST_CMD_TEMPLATE.format(
+                test_args=test_args, pytest_flags=pytest_flags
+            )
+            subprocess.run(
+                ["docker", "cp", patch_tmp.name, f"{container_id}:/tmp/solution.patch"],
+                capture_output=True,
+                check=True,
+                timeout=60,
+            )
+            returncode, stdout_tail, stderr_tail = _run_with_tail(
+                ["docker", "exec", container_id, "bash", "-c", test_cmd], timeout=180
+            )
+            passed = returncode == 0
+            oa.log(f"Test stdout tail: {stdout_tail}")
+            if not passed:
+                oa.log(
+                    f"Tests failed (exit {returncode}) for image={image_name}; "
+                    f"stderr: {stderr_tail or '(none)'}"
+                )
+            _release_container(image_name, container_id)
+            container_id = None
+            return passed, "tests_passed" if passed else "tests_failed"
+        except subprocess.TimeoutExpired:
+            oa.log(f"Test run timed out (180s) for image={image_name}")
+            return False, "test_timeout"
+        except subprocess.CalledProcessError as exc:
+            stderr = (
+                exc.stderr.decode() if isinstance(exc.stderr, bytes) else exc.stderr
+            )
             oa.log(
-                f"Tests failed (exit {result.returncode}) for image={image_name}; "
-                f"stderr: {result.stderr[-200:] if result.stderr else '(none)'}"
+                f"Docker command failed (exit {exc.returncode}) for image={image_name}; "
+                f"stderr: {stderr[-200:] if stderr else '(none)'}"
             )
-        return passed, "tests_passed" if passed else "tests_failed"
-    except subprocess.TimeoutExpired:
-        oa.log(f"Test run timed out (180s) for image={image_name}")
-        return False, "test_timeout"
-    except FileNotFoundError:
-        oa.log(
-            "Docker executable not found; ensure Docker is installed and running. "
-            "All evaluations will score 0.0 until Docker is available."
-        )
-        return False, "docker_not_found"
-    finally:
-        os.unlink(patch_file)
+            return False, "docker_error"
+        except FileNotFoundError:
+            oa.log(
+                "Docker executable not found; ensure Docker is installed and running. "
+                "All evaluations will score 0.0 until Docker is available."
+            )
+            return False, "docker_not_found"
+        finally:
+            if container_id is not None:
+                _discard_container(container_id)
 
 
 def make_evaluator(
@@ -119,12 +398,16 @@ def make_evaluator(
     """Create a GEPA-compatible evaluator that runs mini-SWE-Agent on a SWE-smith task.
 
     The returned evaluator:
-      1. Writes the candidate skill into a temporary mini config YAML.
+      1. Overlays the candidate skill on the parsed swebench config as the
+         agent's system template.
       2. Runs mini's Python API (swebench mode) on the task in Docker.
       3. Extracts the submitted patch from the agent's trajectory.
-      4. Verifies the patch by running FAIL_TO_PASS tests in a fresh container.
+      4. Verifies the patch by running FAIL_TO_PASS tests in a pooled container.
       5. Returns (score, side_info) for GEPA reflection.
 
+    Every call uses its own temp files and checks out its own test container
+    from the pool, so GEPA can run the evaluator from several worker threads.
+
     Args:
         agent_model: LiteLLM model string for mini-SWE-agent (e.g. ``openai/gpt-5.2``).
             Falls back to the ``GSKILL_AGENT_MODEL`` env var, then ``openai/gpt-5.2``.
@@ -135,51 +418,60 @@ def make_evaluator(
     resolved_model = agent_model or os.environ.get(
         "GSKILL_AGENT_MODEL", "openai/gpt-5.2"
     )
+    base_config = recursive_merge(
+        _BASE_CONFIG, {"model": {"model_name": resolved_model}}
+    )
+    # Models keep no per-run state (costs go to a global, locked tracker), so
+    # one client is shared by every evaluation and worker thread.
+    model = get_model(config=base_config.get("model", {}))
 
     def evaluate(candidate_skill: str, task: dict) -> tuple[float, dict]:
-        skill_config_path = _write_skill_config(candidate_skill)
-        traj_tmp = tempfile.NamedTemporaryFile(
-            suffix=".traj.json", delete=False, prefix="gskill_traj_"
-        )
-        traj_tmp.close()
-
         patch = ""
         score = 0.0
         error_msg = ""
         test_reason = ""
         env = None
 
-        try:
-            configs = [
-                get_config_from_spec(str(_SWEBENCH_CONFIG)),
-                get_config_from_spec(str(skill_config_path)),
-                {"agent": {"output_path": traj_tmp.name}},
-                {"model": {"model_name": resolved_model}},
-            ]
-            config = recursive_merge(*configs)
-
-            env = get_sb_environment(config, task)
-            model = get_model(config=config.get("model", {}))
-            agent = get_agent(
-                model, env, config.get("agent", {}), default_type="default"
-            )
+        with tempfile.NamedTemporaryFile(
+            suffix=".traj.json",
+            prefix="gskill_traj_",
+            dir=_TMPDIR,
+            delete_on_close=False,
+        ) as traj_tmp:
+            traj_tmp.close()
+            try:
+                config = recursive_merge(
+                    base_config,
+                    {
+                        "agent": {
+                            "system_template": _SYSTEM_PREFIX + candidate_skill,
+                            "output_path": traj_tmp.name,
+                        }
+                    },
+                )
 
-            result = agent.run(task["problem_statement"])
-            patch = result.get("submission", "") or ""
+                env = get_sb_environment(config, task)
+                agent = get_agent(
+                    model, env, config.get("agent", {}), default_type="default"
+                )
 
-        except Exception as e:
-            error_msg = f"{type(e).__name__}: {e}"
-            oa.log(f"Mini run error: {error_msg}")
-        finally:
-            if env is not None:
-                env.cleanup()
-            for path in (skill_config_path, traj_tmp.name):
-                try:
-                    os.unlink(path)
-                except OSError:
-                    pass
-
-        if patch.strip():
+                result = agent.run(task["problem_statement"])
+                patch = result.get("submission", "") or ""
+
+            except Exception as e:
+                error_msg = f"{type(e).__name__}: {e}"
+                oa.log(f"Mini run error: {error_msg}")
+            finally:
+                if env is not None:
+                    env.cleanup()
+
+        if patch.strip() and not _patch_touches_code(patch):
+            test_reason = "no_code_changes"
+            oa.log(
+                f"instance={task.get('instance_id')} patch={len(patch)}chars "
+                "touches no code; skipping tests score=0.0"
+            )
+        elif patch.strip():
             passed, test_reason = _run_tests(task, patch)
             score = 1.0 if passed else 0.0
             oa.log(
@@ -1,20 +1,44 @@
 """Top-level pipeline orchestration for gskill."""
 
+import os
+
 from gepa.optimize_anything import EngineConfig, GEPAConfig, optimize_anything
 
-from .evaluator import make_evaluator
-from .skill import generate_initial_skill, save_skill
+from .evaluator import make_evaluator, prepull_images
+from .skill import GITHUB_REPO_RE, generate_initial_skill, save_skill
 from .tasks import load_tasks, split_tasks
 
 
 def _extract_repo_name(repo_url: str) -> str:
     """Extract 'owner/repo' from a GitHub URL or pass-through if already in that form."""
-    url = repo_url.rstrip("/")
-    if "github.com" in url:
-        parts = url.split("github.com/")[-1].split("/")
-        return f"{parts[0]}/{parts[1]}"
-    # Assume already "owner/repo" or "repo"
-    return url
+    match = GITHUB_REPO_RE.match(repo_url.strip())
+    if not match:
+        # Leave malformed input for load_tasks to reject with a clear message
+        return repo_url
+    return f"{match['owner']}/{match['repo']}"
+
+
+def _resolve_max_concurrent(max_concurrent: int | None) -> int:
+    """Resolve the number of evaluations GEPA may run at once.
+
+    Each evaluation is an independent Docker + LLM round-trip, so the work is
+    I/O-bound and threads are enough; the cap mostly protects Docker and the
+    model API from being flooded.
+    """
+    if max_concurrent is None:
+        env_value = os.environ.get("GSKILL_MAX_CONCURRENT")
+        if env_value:
+            try:
+                max_concurrent = int(env_value)
+            except ValueError:
+                raise ValueError(
+                    f"GSKILL_MAX_CONCURRENT must be an integer, got {env_value!r}."
+                ) from None
+    if max_concurrent is None:
+        max_concurrent = min(8, os.cpu_count() or 1)
+    if max_concurrent < 1:
+        raise ValueError(f"max_concurrent must be at least 1, got {max_concurrent}.")
+    return max_concurrent
 
 
 def run(
@@ -25,6 +49,7 @@ def run(
     agent_model: str | None = None,
     skill_model: str | None = None,
     base_url: str | None = None,
+    max_concurrent: int | None = None,
 ) -> object:
     """Run the full gskill pipeline for a repository.
 
@@ -40,11 +65,15 @@ def run(
             ``GSKILL_SKILL_MODEL`` env var, then ``gpt-5.2``.
         base_url: OpenAI-compatible base URL for local models. Falls back to
             ``OPENAI_BASE_URL`` env var.
+        max_concurrent: Maximum number of evaluations (mini run + Docker tests)
+            in flight at once. Falls back to ``GSKILL_MAX_CONCURRENT`` env var,
+            then ``min(8, os.cpu_count())``.
 
     Returns:
         GEPA result object with ``best_candidate`` and ``best_score`` attributes.
     """
     repo_name = _extract_repo_name(repo_url)
+    workers = _resolve_max_concurrent(max_concurrent)
     print(f"[gskill] Repo: {repo_name}")
 
     print("[gskill] Loading tasks from SWE-smith...")
@@ -52,6 +81,14 @@ def run(
     train, val, test = split_tasks(tasks)
     print(f"[gskill] Tasks: {len(train)} train / {len(val)} val / {len(test)} test")
 
+    print("[gskill] Pre-pulling Docker images for train/val tasks...")
+    failed_pulls = prepull_images([*train, *val])
+    if failed_pulls:
+        print(
+            f"[gskill] Warning: could not pull {len(failed_pulls)} image(s); "
+            "they will be pulled on first use: " + ", ".join(failed_pulls)
+        )
+
     seed_skill: str | None = None
     if use_initial_skill:
         print("[gskill] Generating initial skill...")
@@ -73,7 +110,10 @@ def run(
 
     evaluator = make_evaluator(agent_model=agent_model)
 
-    print(f"[gskill] Starting GEPA optimization (max_evals={max_evals})...")
+    print(
+        f"[gskill] Starting GEPA optimization "
+        f"(max_evals={max_evals}, max_concurrent={workers})..."
+    )
     result = optimize_anything(
         seed_candidate=seed_skill,
         evaluator=evaluator,
@@ -89,6 +129,8 @@ def run(
             engine=EngineConfig(
                 max_metric_calls=max_evals,
                 raise_on_exception=False,
+                parallel=True,
+                max_workers=workers,
             ),
         ),
     )
@@ -1,13 +1,23 @@
-"""Initial skill generation skill file I/O."""
+"""Initial skill generation and skill file I/O."""
 
+import asyncio
 import base64
-import json
+import functools
+import hashlib
 import os
 import re
-import urllib.request
 from pathlib import Path
 
+import httpx
 import openai
+import orjson
+
+# "owner/repo" from a GitHub URL or bare slug; tolerates a .git suffix and
+# trailing paths like /tree/main.
+GITHUB_REPO_RE = re.compile(
+    r"^(?:(?:https?://)?(?:www\.)?github\.com/)?"
+    r"(?P<owner>[^/\s]+)/(?P<repo>[^/\s]+?)(?:\.git)?(?:/.*)?$"
+)
 
 
 def _make_skill_name(repo: str) -> str:
@@ -31,36 +41,141 @@ def _completion_token_kwargs(model: str, max_output_tokens: int) -> dict[str, in
     return {"max_tokens": max_output_tokens}
 
 
-def _fetch_readme(owner: str, repo: str, max_chars: int = 3000) -> str:
+@functools.lru_cache(maxsize=4)
+def _get_openai_client(base_url: str | None, api_key: str | None) -> openai.OpenAI:
+    """Return a process-wide OpenAI client per endpoint/key.
+
+    Reusing the client keeps its HTTP/2 connection pool and TLS session warm
+    across calls instead of rebuilding them each time.
+    """
+    client_kwargs: dict = {}
+    if base_url:
+        client_kwargs["base_url"] = base_url
+    if api_key:
+        client_kwargs["api_key"] = api_key
+    return openai.OpenAI(
+        http_client=openai.DefaultHttpxClient(
+            http2=True, limits=httpx.Limits(max_keepalive_connections=10)
+        ),
+        # Fail fast on unreachable endpoints; long generations keep the
+        # SDK's default read budget.
+        timeout=httpx.Timeout(600.0, connect=5.0),
+        **client_kwargs,
+    )
+
+
+_GITHUB_HEADERS = {"User-Agent": "gskill/0.1"}
+
+# Config files probed for test/build info, in order of preference.
+_CONFIG_CANDIDATES = (
+    "pyproject.toml",
+    "setup.cfg",
+    "tox.ini",
+    "Makefile",
+    "pytest.ini",
+)
+
+
+# On-disk cache for GitHub responses (ETag-validated) and generated seed skills.
+_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "gskill"
+
+
+def _cache_path(namespace: str, key: str) -> Path:
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    return _CACHE_DIR / namespace / f"{digest}.json"
+
+
+def _cache_get(namespace: str, key: str) -> dict | None:
+    """Return the cached entry for ``key``, or None if missing or unreadable."""
+    try:
+        return orjson.loads(_cache_path(namespace, key).read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_put(namespace: str, key: str, value: dict) -> None:
+    """Store ``value`` for ``key``; caching is best-effort and never raises."""
+    path = _cache_path(namespace, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(orjson.dumps(value))
+    except OSError:
+        pass
+
+
+async def _fetch_content(client: httpx.AsyncClient, url: str) -> str:
+    """GET a GitHub contents URL and return the decoded file.
+
+    Sends the cached ETag as ``If-None-Match`` so unchanged files come back as
+    a 304 (which doesn't count against the rate limit) and are served from disk.
+    """
+    cached = _cache_get("github", url)
+    headers = {"If-None-Match": cached["etag"]} if cached else {}
+    resp = await client.get(url, headers=headers)
+    if resp.status_code == 304 and cached:
+        return cached["content"]
+    resp.raise_for_status()
+    data = orjson.loads(resp.content)
+    if data.get("encoding") != "base64":
+        return ""
+    content = base64.b64decode(data["content"]).decode("utf-8", errors="replace")
+    if etag := resp.headers.get("ETag"):
+        _cache_put("github", url, {"etag": etag, "content": content})
+    return content
+
+
+async def _fetch_readme(
+    client: httpx.AsyncClient, owner: str, repo: str, max_chars: int = 3000
+) -> str:
     """Fetch the README from GitHub API."""
     url = f"https://api.github.com/repos/{owner}/{repo}/readme"
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "gskill/0.1"})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read())
-            content = base64.b64decode(data["content"]).decode(
-                "utf-8", errors="replace"
-            )
-            return content[:max_chars]
+        content = await _fetch_content(client, url)
+        return content[:max_chars]
     except Exception:
         return ""
 
 
-def _fetch_file(owner: str, repo: str, path: str, max_chars: int = 2000) -> str:
+async def _fetch_file(
+    client: httpx.AsyncClient,
+    owner: str,
+    repo: str,
+    path: str,
+    max_chars: int = 2000,
+) -> str:
     """Fetch a specific file from GitHub API."""
     url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "gskill/0.1"})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read())
-            if data.get("encoding") == "base64":
-                content = base64.b64decode(data["content"]).decode(
-                    "utf-8", errors="replace"
-                )
-                return content[:max_chars]
+        content = await _fetch_content(client, url)
+        return content[:max_chars]
     except Exception:
-        pass
-    return ""
+        return ""
+
+
+async def _fetch_all(owner: str, repo: str) -> tuple[str, str]:
+    """Fetch the README and config candidates concurrently over one connection.
+
+    Returns:
+        Tuple of (readme, extra_context) where extra_context holds the first
+        config candidate that exists, formatted for the prompt.
+    """
+    async with httpx.AsyncClient(
+        http2=True, headers=_GITHUB_HEADERS, timeout=10
+    ) as client:
+        readme, *configs = await asyncio.gather(
+            _fetch_readme(client, owner, repo),
+            *(
+                _fetch_file(client, owner, repo, candidate, max_chars=1500)
+                for candidate in _CONFIG_CANDIDATES
+            ),
+        )
+
+    extra_context = ""
+    for candidate, content in zip(_CONFIG_CANDIDATES, configs):
+        if content:
+            extra_context = f"\n\n### {candidate}\n```\n{content}\n```"
+            break  # one is enough
+    return readme, extra_context
 
 
 def generate_initial_skill(
@@ -71,7 +186,8 @@ def generate_initial_skill(
     """Generate an initial SKILL.md for the repo via static analysis.
 
     Fetches the README and common config files, then asks a model to synthesize
-    repo-specific guidance for a coding agent.
+    repo-specific guidance for a coding agent. GitHub responses and generated
+    skills are cached under ``~/.cache/gskill``.
 
     Args:
         repo_url: Full GitHub URL, e.g. 'https://github.com/pallets/jinja'.
@@ -81,26 +197,14 @@ def generate_initial_skill(
     Returns:
         Skill content as a string (YAML frontmatter + markdown body).
     """
-    # Parse owner/repo from URL
-    parts = repo_url.rstrip("/").split("/")
-    owner, repo = parts[-2], parts[-1]
+    match = GITHUB_REPO_RE.match(repo_url.strip())
+    if not match:
+        raise ValueError(f"Could not parse 'owner/repo' from {repo_url!r}.")
+    owner, repo = match["owner"], match["repo"]
     skill_name = _make_skill_name(repo)
 
-    readme = _fetch_readme(owner, repo)
-
-    # Try to grab common config files for test/build info
-    extra_context = ""
-    for candidate in [
-        "pyproject.toml",
-        "setup.cfg",
-        "tox.ini",
-        "Makefile",
-        "pytest.ini",
-    ]:
-        content = _fetch_file(owner, repo, candidate, max_chars=1500)
-        if content:
-            extra_context += f"\n\n### {candidate}\n```\n{content}\n```"
-            break  # one is enough
+    # README plus common config files for test/build info, fetched in parallel
+    readme, extra_context = asyncio.run(_fetch_all(owner, repo))
 
     resolved_base_url = base_url or os.environ.get("OPENAI_BASE_URL")
     resolved_model = model or os.environ.get("GSKILL_SKILL_MODEL")
@@ -119,21 +223,7 @@ def generate_initial_skill(
     if "/" in resolved_model:
         resolved_model = resolved_model.split("/", 1)[1]
 
-    client_kwargs: dict = {}
-    if resolved_base_url:
-        client_kwargs["base_url"] = resolved_base_url
-    if not os.environ.get("OPENAI_API_KEY") and resolved_base_url:
-        client_kwargs["api_key"] = "none"
-
-    client = openai.OpenAI(**client_kwargs)
-    try:
-        message = client.chat.completions.create(
-            model=resolved_model,
-            **_completion_token_kwargs(resolved_model, 2000),
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"""You are generating a SKILL.md for the '{repo}' repository.
+    prompt = f"""You are generating a SKILL.md for the '{repo}' repository.
 This skill file will be injected into the system prompt of a coding agent that must
 solve GitHub issues by modifying source files in a Docker container at /testbed.
 
@@ -166,7 +256,28 @@ Constraints:
 - The `description` must be non-empty, at most 1024 characters, and must not contain angle-bracket XML tags.
 - Be specific and actionable. Write for an AI agent, not a human developer.
 - Do NOT include generic advice that applies to all Python projects.
-- Focus on what is distinctive about {repo}.""",
+- Focus on what is distinctive about {repo}."""
+
+    # Identical inputs produce an equivalent seed, so skip the model call when
+    # nothing about the repo, prompt, model, or endpoint has changed.
+    cache_key = "\0".join([resolved_base_url or "", resolved_model, prompt])
+    cached = _cache_get("skills", cache_key)
+    if cached:
+        return cached["content"]
+
+    # Local backends often need no key, but the client refuses to start without one
+    api_key = (
+        "none" if resolved_base_url and not os.environ.get("OPENAI_API_KEY") else None
+    )
+    client = _get_openai_client(resolved_base_url, api_key)
+    try:
+        message = client.chat.completions.create(
+            model=resolved_model,
+            **_completion_token_kwargs(resolved_model, 2000),
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt,
                 }
             ],
         )
@@ -188,6 +299,7 @@ Constraints:
             f"Skill generation failed — model {resolved_model!r} returned an empty response "
             "(the model may have invoked a tool instead of generating text, or the response was filtered)"
         )
+    _cache_put("skills", cache_key, {"content": content})
     return content
 
 
@@ -1,8 +1,11 @@
 """SWE-smith dataset loading and splitting."""
 
+import functools
 import re
 
-from datasets import load_dataset
+import pyarrow as pa
+import pyarrow.compute as pc
+from datasets import Dataset, load_dataset
 
 DATASET_NAME = "SWE-bench/SWE-smith"
 REPO_NAME_RE = re.compile(r"^[^/\s]+/[^/\s]+$")
@@ -24,13 +27,41 @@ def _dataset_repo_name(raw_repo: str) -> str:
     return slug.split(".", 1)[0].replace("__", "/")
 
 
+@functools.lru_cache(maxsize=1)
+def _load_swesmith() -> Dataset:
+    """Load the memory-mapped SWE-smith train split once per process."""
+    return load_dataset(DATASET_NAME, split="train")
+
+
+def _raw_repo_ids(ds: Dataset) -> list[str]:
+    """Return the distinct raw ``repo`` ids, computed on the Arrow column."""
+    return pc.unique(ds.data.column("repo")).to_pylist()
+
+
+@functools.lru_cache(maxsize=32)
+def _repo_row_indices(repo_name: str) -> tuple[int, ...]:
+    """Return the dataset row indices for ``repo_name``, scanning only once.
+
+    Distinct repo ids are few, so only they are normalized in Python; rows are
+    found with a vectorized is_in over the repo column.
+    """
+    ds = _load_swesmith()
+    matching_ids = [
+        raw for raw in _raw_repo_ids(ds) if _dataset_repo_name(raw) == repo_name
+    ]
+    mask = pc.is_in(
+        ds.data.column("repo"), value_set=pa.array(matching_ids, pa.string())
+    )
+    return tuple(pc.indices_nonzero(mask).to_pylist())
+
+
 def list_supported_repos(query: str | None = None) -> list[str]:
     """Return the unique repository slugs available in SWE-smith."""
-    ds = load_dataset(DATASET_NAME, split="train", streaming=True)
+    ds = _load_swesmith()
     filter_text = query.lower() if query else None
     repos: set[str] = set()
-    for task in ds:
-        repo_name = _dataset_repo_name(task["repo"])
+    for raw_repo in _raw_repo_ids(ds):
+        repo_name = _dataset_repo_name(raw_repo)
         if filter_text and filter_text not in repo_name.lower():
             continue
         repos.add(repo_name)
@@ -54,15 +85,10 @@ def load_tasks(repo_name: str, n: int = 300) -> list[dict]:
             "e.g., 'pallets/jinja'."
         )
 
-    # Stream from the Hub so we don't materialize the full dataset locally.
-    ds = load_dataset(DATASET_NAME, split="train", streaming=True)
-    tasks: list[dict] = []
-    for task in ds:
-        if _dataset_repo_name(task["repo"]) != repo_name:
-            continue
-        tasks.append(dict(task))
-        if len(tasks) >= n:
-            break
+    # Calls with a different n reuse the cached scan, and only the first n
+    # matching rows are ever decoded.
+    indices = _repo_row_indices(repo_name)
+    tasks = _load_swesmith().select(indices[:n]).to_list()
     if not tasks:
         raise ValueError(
             f"Repository '{repo_name}' has no tasks in {DATASET_NAME}. "
@@ -0,0 +1,313 @@
+"""Tests for evaluator helpers."""
+
+import asyncio
+import os
+import subprocess
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.evaluator import (
+    _CONTAINER_POOL,
+    _LIVE_CONTAINERS,
+    _SYSTEM_PREFIX,
+    _TMPDIR,
+    _XDIST_CONTAINERS,
+    _patch_touches_code,
+    _run_tests,
+    _run_with_tail,
+    make_evaluator,
+    prepull_images,
+)
+
+
+class MakeEvaluatorTests(unittest.TestCase):
+    def test_model_is_built_once_and_skill_becomes_system_template(self) -> None:
+        agent_configs: list[dict] = []
+
+        def fake_get_agent(model, env, agent_config, default_type):
+            agent_configs.append(agent_config)
+            return SimpleNamespace(run=lambda problem: {"submission": ""})
+
+        with (
+            patch("src.evaluator.get_model") as mock_get_model,
+            patch("src.evaluator.get_sb_environment"),
+            patch("src.evaluator.get_agent", side_effect=fake_get_agent),
+            patch("src.evaluator.oa.log"),
+        ):
+            evaluate = make_evaluator(agent_model="openai/gpt-5-mini")
+            evaluate("skill A", {"instance_id": "1", "problem_statement": "bug"})
+            evaluate("skill B", {"instance_id": "2", "problem_statement": "bug"})
+
+        mock_get_model.assert_called_once()
+        self.assertEqual(
+            mock_get_model.call_args.kwargs["config"]["model_name"],
+            "openai/gpt-5-mini",
+        )
+        self.assertEqual(
+            [c["system_template"] for c in agent_configs],
+            [_SYSTEM_PREFIX + "skill A", _SYSTEM_PREFIX + "skill B"],
+        )
+
+
+def _diff(*paths: str) -> str:
+    return "".join(
+        f"diff --git a/{p} b/{p}\n--- a/{p}\n+++ b/{p}\n@@ -1 +1 @@\n-old\n+new\n"
+        for p in paths
+    )
+
+
+class PatchTouchesCodeTests(unittest.TestCase):
+    def test_source_changes_count_as_code(self) -> None:
+        self.assertTrue(_patch_touches_code(_diff("src/jinja2/lexer.py")))
+        self.assertTrue(_patch_touches_code(_diff("README.md", "setup.cfg")))
+
+    def test_docs_only_patches_are_not_code(self) -> None:
+        self.assertFalse(_patch_touches_code(_diff("README.md", "docs/api.rst")))
+
+    def test_doc_files_under_tests_count_as_code(self) -> None:
+        self.assertTrue(_patch_touches_code(_diff("tests/fixtures/expected.txt")))
+
+    def test_deleted_source_file_counts_as_code(self) -> None:
+        patch = "--- a/src/old.py\n+++ /dev/null\n@@ -1 +0,0 @@\n-x = 1\n"
+        self.assertTrue(_patch_touches_code(patch))
+
+    def test_pure_rename_counts_as_code(self) -> None:
+        patch = (
+            "diff --git a/src/a.py b/src/b.py\n"
+            "similarity index 100%\n"
+            "rename from src/a.py\n"
+            "rename to src/b.py\n"
+        )
+        self.assertTrue(_patch_touches_code(patch))
+
+    def test_doc_rename_is_not_code(self) -> None:
+        patch = (
+            "diff --git a/docs/old.md b/docs/new.md\n"
+            "similarity index 100%\n"
+            "rename from docs/old.md\n"
+            "rename to docs/new.md\n"
+        )
+        self.assertFalse(_patch_touches_code(patch))
+
+    def test_mode_change_counts_as_code(self) -> None:
+        patch = "diff --git a/run.py b/run.py\nold mode 100644\nnew mode 100755\n"
+        self.assertTrue(_patch_touches_code(patch))
+
+    def test_binary_change_counts_as_code(self) -> None:
+        patch = (
+            "diff --git a/src/data.bin b/src/data.bin\n"
+            "index 1234567..89abcde 100644\n"
+            "Binary files a/src/data.bin and b/src/data.bin differ\n"
+        )
+        self.assertTrue(_patch_touches_code(patch))
+
+    def test_text_without_diff_headers_is_not_code(self) -> None:
+        self.assertFalse(_patch_touches_code("I could not fix this issue."))
+
+
+class PrepullImagesTests(unittest.TestCase):
+    def test_pulls_each_image_once_with_bounded_parallelism(self) -> None:
+        pulled: list[str] = []
+        in_flight = 0
+        peak = 0
+
+        async def fake_exec(*cmd: str, **kwargs: object) -> SimpleNamespace:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            pulled.append(cmd[-1])
+
+            async def wait() -> int:
+                nonlocal in_flight
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+                return 1 if cmd[-1] == "img/broken" else 0
+
+            return SimpleNamespace(wait=wait)
+
+        tasks = [{"image_name": f"img/{i % 5}"} for i in range(20)]
+        tasks.append({"image_name": "img/broken"})
+
+        with patch(
+            "src.evaluator.asyncio.create_subprocess_exec", side_effect=fake_exec
+        ):
+            failed = prepull_images(tasks, max_parallel=2)
+
+        self.assertEqual(
+            sorted(pulled), [*(f"img/{i}" for i in range(5)), "img/broken"]
+        )
+        self.assertLessEqual(peak, 2)
+        self.assertEqual(failed, ["img/broken"])
+
+
+class RunWithTailTests(unittest.TestCase):
+    def test_keeps_only_the_last_lines(self) -> None:
+        returncode, stdout_tail, stderr_tail = _run_with_tail(
+            [
+                sys.executable,
+                "-c",
+                (
+                    "import sys\n"
+                    "for i in range(200): print(i)\n"
+                    "print('oops', file=sys.stderr)\n"
+                    "sys.exit(3)"
+                ),
+            ],
+            timeout=30,
+            max_lines=3,
+        )
+
+        self.assertEqual(returncode, 3)
+        self.assertEqual(stdout_tail, "197\n198\n199\n")
+        self.assertEqual(stderr_tail, "oops\n")
+
+    def test_timeout_kills_the_process(self) -> None:
+        with self.assertRaises(subprocess.TimeoutExpired):
+            _run_with_tail(
+                [sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.5
+            )
+
+
+class RunTestsContainerPoolTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.instance = {
+            "instance_id": "pallets__jinja.1",
+            "image_name": "swesmith/pallets__jinja.aaaa",
+            "FAIL_TO_PASS": ["tests/test_api.py::test_a"],
+        }
+        self.commands: list[list[str]] = []
+        _CONTAINER_POOL.clear()
+        _LIVE_CONTAINERS.clear()
+        _XDIST_CONTAINERS.clear()
+        for patcher in (
+            patch("src.evaluator.oa.log"),
+            patch("src.evaluator._run_with_tail", side_effect=self.fake_run_with_tail),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        _CONTAINER_POOL.clear()
+        _LIVE_CONTAINERS.clear()
+        _XDIST_CONTAINERS.clear()
+
+    def pytest_commands(self) -> list[str]:
+        return [c[-1] for c in self.commands if "--tb=no" in c[-1]]
+
+    def fake_run_with_tail(
+        self, cmd: list[str], timeout: float
+    ) -> tuple[int, str, str]:
+        # Route streamed commands through the (patched) subprocess.run fake.
+        result = subprocess.run(cmd, check=False, timeout=timeout)
+        return result.returncode, result.stdout, result.stderr
+
+    def fake_run(self, cmd: list[str], **kwargs: object) -> SimpleNamespace:
+        self.commands.append(cmd)
+        if cmd[:2] == ["docker", "run"]:
+            return SimpleNamespace(returncode=0, stdout="cid123\n", stderr="")
+        if cmd[:2] == ["docker", "exec"] and "--tb=no" in cmd[-1]:
+            return SimpleNamespace(returncode=0, stdout="1 passed", stderr="")
+        return SimpleNamespace(returncode=0, stdout="", stderr="")
+
+    def test_container_is_started_once_and_reused(self) -> None:
+        with patch("src.evaluator.subprocess.run", side_effect=self.fake_run):
+            first = _run_tests(self.instance, "diff")
+            second = _run_tests(self.instance, "diff")
+
+        self.assertEqual(first, (True, "tests_passed"))
+        self.assertEqual(second, (True, "tests_passed"))
+        starts = [c for c in self.commands if c[:2] == ["docker", "run"]]
+        self.assertEqual(len(starts), 1)
+        self.assertIn("gskill.pool=1", starts[0])
+        self.assertEqual(_CONTAINER_POOL[self.instance["image_name"]], ["cid123"])
+
+    def test_patch_file_is_scratch_and_removed(self) -> None:
+        with patch("src.evaluator.subprocess.run", side_effect=self.fake_run):
+            _run_tests(self.instance, "diff")
+
+        (copy_cmd,) = [c for c in self.commands if c[:2] == ["docker", "cp"]]
+        self.assertEqual(os.path.dirname(copy_cmd[2]), _TMPDIR)
+        self.assertFalse(os.path.exists(copy_cmd[2]))
+
+    def test_uses_one_xdist_worker_per_test_file(self) -> None:
+        instance = {
+            **self.instance,
+            "FAIL_TO_PASS": [
+                "tests/test_api.py::test_a",
+                "tests/test_api.py::test_b",
+                "tests/test_lexer.py::test_c",
+            ],
+        }
+        with (
+            patch("src.evaluator.subprocess.run", side_effect=self.fake_run),
+            patch("src.evaluator.os.cpu_count", return_value=8),
+        ):
+            _run_tests(instance, "diff")
+
+        (pytest_cmd,) = self.pytest_commands()
+        self.assertIn("-n 2 --dist=loadfile", pytest_cmd)
+        self.assertNotIn(" -x ", pytest_cmd)
+
+    def test_single_test_file_stays_serial_with_xdist(self) -> None:
+        with patch("src.evaluator.subprocess.run", side_effect=self.fake_run):
+            _run_tests(self.instance, "diff")
+
+        self.assertIn("cid123", _XDIST_CONTAINERS)
+        (pytest_cmd,) = self.pytest_commands()
+        self.assertIn(" -x ", pytest_cmd)
+        self.assertNotIn(" -n ", pytest_cmd)
+
+    def test_falls_back_to_serial_when_xdist_is_unavailable(self) -> None:
+        def fake_run(cmd: list[str], **kwargs: object) -> SimpleNamespace:
+            if cmd[:2] == ["docker", "exec"] and "pip install" in cmd[-1]:
+                self.commands.append(cmd)
+                return SimpleNamespace(returncode=1, stdout="", stderr="")
+            return self.fake_run(cmd, **kwargs)
+
+        instance = {
+            **self.instance,
+            "FAIL_TO_PASS": [
+                "tests/test_api.py::test_a",
+                "tests/test_lexer.py::test_c",
+            ],
+        }
+        with patch("src.evaluator.subprocess.run", side_effect=fake_run):
+            result = _run_tests(instance, "diff")
+
+        self.assertEqual(result, (True, "tests_passed"))
+        (pytest_cmd,) = self.pytest_commands()
+        self.assertIn(" -x ", pytest_cmd)
+        self.assertNotIn(" -n ", pytest_cmd)
+
+    def test_container_start_timeout_is_not_a_test_timeout(self) -> None:
+        def fake_run(cmd: list[str], **kwargs: object) -> SimpleNamespace:
+            if cmd[:2] == ["docker", "run"]:
+                raise subprocess.TimeoutExpired(cmd, 600)
+            return self.fake_run(cmd, **kwargs)
+
+        with patch("src.evaluator.subprocess.run", side_effect=fake_run):
+            result = _run_tests(self.instance, "diff")
+
+        self.assertEqual(result, (False, "container_start_timeout"))
+        self.assertFalse(self.pytest_commands())
+
+    def test_timed_out_container_is_discarded(self) -> None:
+        def fake_run(cmd: list[str], **kwargs: object) -> SimpleNamespace:
+            if cmd[:2] == ["docker", "exec"] and "--tb=no" in cmd[-1]:
+                self.commands.append(cmd)
+                raise subprocess.TimeoutExpired(cmd, 180)
+            return self.fake_run(cmd, **kwargs)
+
+        with patch("src.evaluator.subprocess.run", side_effect=fake_run):
+            result = _run_tests(self.instance, "diff")
+
+        self.assertEqual(result, (False, "test_timeout"))
+        self.assertIn(["docker", "rm", "-f", "cid123"], self.commands)
+        self.assertNotIn("cid123", _LIVE_CONTAINERS)
+        self.assertFalse(_CONTAINER_POOL.get(self.instance["image_name"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
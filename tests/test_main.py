@@ -8,6 +8,27 @@ from typer.testing import CliRunner
 from main import app
 
 
+class RunCommandTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    def test_run_command_passes_max_concurrent(self) -> None:
+        with patch("src.pipeline.run") as mock_run:
+            result = self.runner.invoke(
+                app, ["run", "pallets/jinja", "--max-concurrent", "4"]
+            )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_run.call_args.kwargs["max_concurrent"], 4)
+
+    def test_run_command_defaults_max_concurrent_to_none(self) -> None:
+        with patch("src.pipeline.run") as mock_run:
+            result = self.runner.invoke(app, ["run", "pallets/jinja"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIsNone(mock_run.call_args.kwargs["max_concurrent"])
+
+
 class ReposCommandTests(unittest.TestCase):
     def setUp(self) -> None:
         self.runner = CliRunner()
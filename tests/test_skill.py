@@ -1,10 +1,31 @@
 """Tests for skill-generation helpers."""
 
+import asyncio
+import base64
+import tempfile
 import unittest
+from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import patch
 
-from src.skill import _completion_token_kwargs, generate_initial_skill
+import httpx
+
+from src.skill import (
+    _completion_token_kwargs,
+    _fetch_all,
+    _fetch_content,
+    _get_openai_client,
+    generate_initial_skill,
+)
+
+
+class TempCacheDirTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cache_patcher = patch("src.skill._CACHE_DIR", Path(tmp.name))
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
 
 
 class CompletionTokenKwargsTests(unittest.TestCase):
@@ -27,7 +48,75 @@ class CompletionTokenKwargsTests(unittest.TestCase):
         )
 
 
-class GenerateInitialSkillTests(unittest.TestCase):
+class FetchAllTests(unittest.TestCase):
+    def test_uses_first_config_candidate_that_exists(self) -> None:
+        async def fake_fetch_file(client, owner, repo, path, max_chars=2000):
+            return {"tox.ini": "[tox]", "pytest.ini": "[pytest]"}.get(path, "")
+
+        with (
+            patch("src.skill._fetch_readme", return_value="readme"),
+            patch("src.skill._fetch_file", side_effect=fake_fetch_file),
+        ):
+            readme, extra_context = asyncio.run(_fetch_all("pallets", "jinja"))
+
+        self.assertEqual(readme, "readme")
+        self.assertIn("### tox.ini", extra_context)
+        self.assertNotIn("pytest.ini", extra_context)
+
+
+class FetchContentTests(TempCacheDirTestCase):
+    url = "https://api.github.com/repos/pallets/jinja/readme"
+
+    def test_not_modified_response_is_served_from_cache(self) -> None:
+        seen_etags: list[str | None] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_etags.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            body = base64.b64encode(b"# Jinja").decode()
+            return httpx.Response(
+                200,
+                json={"encoding": "base64", "content": body},
+                headers={"ETag": '"v1"'},
+            )
+
+        async def fetch_twice() -> tuple[str, str]:
+            transport = httpx.MockTransport(handler)
+            async with httpx.AsyncClient(transport=transport) as client:
+                return (
+                    await _fetch_content(client, self.url),
+                    await _fetch_content(client, self.url),
+                )
+
+        first, second = asyncio.run(fetch_twice())
+
+        self.assertEqual(first, "# Jinja")
+        self.assertEqual(second, "# Jinja")
+        self.assertEqual(seen_etags, [None, '"v1"'])
+
+
+class GetOpenAIClientTests(unittest.TestCase):
+    def setUp(self) -> None:
+        _get_openai_client.cache_clear()
+        self.addCleanup(_get_openai_client.cache_clear)
+
+    def test_client_is_shared_per_endpoint(self) -> None:
+        with patch("src.skill.openai.OpenAI", side_effect=lambda **kw: object()):
+            first = _get_openai_client(None, None)
+            second = _get_openai_client(None, None)
+            local = _get_openai_client("http://localhost:11434/v1", "none")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, local)
+
+
+class GenerateInitialSkillTests(TempCacheDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        _get_openai_client.cache_clear()
+        self.addCleanup(_get_openai_client.cache_clear)
+
     def test_gpt5_request_uses_max_completion_tokens(self) -> None:
         captured_kwargs: dict[str, object] = {}
 
@@ -56,6 +145,36 @@ class GenerateInitialSkillTests(unittest.TestCase):
         self.assertEqual(captured_kwargs["max_completion_tokens"], 2000)
         self.assertNotIn("max_tokens", captured_kwargs)
 
+    def test_unchanged_inputs_reuse_cached_skill(self) -> None:
+        calls: list[dict[str, object]] = []
+
+        def fake_create(**kwargs: object) -> object:
+            calls.append(kwargs)
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content="skill"))]
+            )
+
+        fake_client = SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=fake_create))
+        )
+
+        with (
+            patch("src.skill._fetch_readme", return_value="readme"),
+            patch("src.skill._fetch_file", return_value=""),
+            patch("src.skill.openai.OpenAI", return_value=fake_client),
+        ):
+            first = generate_initial_skill(
+                "https://github.com/pallets/jinja", model="gpt-5.2"
+            )
+            second = generate_initial_skill(
+                "https://github.com/pallets/jinja", model="gpt-5.2"
+            )
+            generate_initial_skill("https://github.com/pallets/jinja", model="gpt-4o")
+
+        self.assertEqual(first, "skill")
+        self.assertEqual(second, "skill")
+        self.assertEqual([call["model"] for call in calls], ["gpt-5.2", "gpt-4o"])
+
 
 if __name__ == "__main__":
     unittest.main()
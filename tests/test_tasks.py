@@ -1,10 +1,28 @@
 """Tests for SWE-smith task loading helpers."""
 
+import os
 import unittest
 from unittest.mock import patch
 
-from src.pipeline import _extract_repo_name
-from src.tasks import _dataset_repo_name, list_supported_repos, load_tasks
+import pyarrow.compute as pc
+from datasets import Dataset
+
+from src.pipeline import _extract_repo_name, _resolve_max_concurrent
+from src.tasks import (
+    _dataset_repo_name,
+    _load_swesmith,
+    _repo_row_indices,
+    list_supported_repos,
+    load_tasks,
+    split_tasks,
+)
+
+
+class DatasetCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        for cached in (_load_swesmith, _repo_row_indices):
+            cached.cache_clear()
+            self.addCleanup(cached.cache_clear)
 
 
 class DatasetRepoNameTests(unittest.TestCase):
@@ -15,9 +33,9 @@ class DatasetRepoNameTests(unittest.TestCase):
         )
 
 
-class LoadTasksTests(unittest.TestCase):
+class LoadTasksTests(DatasetCacheTestCase):
     def test_load_tasks_returns_matching_rows(self) -> None:
-        fake_rows = iter(
+        fake_ds = Dataset.from_list(
             [
                 {"repo": "swesmith/pallets__jinja.aaaa", "instance_id": "1"},
                 {"repo": "swesmith/pallets__jinja.bbbb", "instance_id": "2"},
@@ -25,11 +43,60 @@ class LoadTasksTests(unittest.TestCase):
             ]
         )
 
-        with patch("src.tasks.load_dataset", return_value=fake_rows):
+        with patch("src.tasks.load_dataset", return_value=fake_ds):
             tasks = load_tasks("pallets/jinja", n=10)
 
         self.assertEqual([task["instance_id"] for task in tasks], ["1", "2"])
 
+    def test_load_tasks_matches_every_snapshot_of_the_repo_only(self) -> None:
+        fake_ds = Dataset.from_list(
+            [
+                {"repo": "swesmith/pallets__jinja.aaaa", "instance_id": "1"},
+                {"repo": "swesmith/pallets__jinja2.bbbb", "instance_id": "2"},
+                {"repo": "swesmith/fastapi__fastapi.cccc", "instance_id": "3"},
+                {"repo": "swesmith/pallets__jinja.dddd", "instance_id": "4"},
+            ]
+        )
+
+        with patch("src.tasks.load_dataset", return_value=fake_ds):
+            tasks = load_tasks("pallets/jinja", n=10)
+
+        self.assertEqual([task["instance_id"] for task in tasks], ["1", "4"])
+
+    def test_load_tasks_caps_results_at_n(self) -> None:
+        fake_ds = Dataset.from_list(
+            [
+                {"repo": "swesmith/pallets__jinja.aaaa", "instance_id": "1"},
+                {"repo": "swesmith/pallets__jinja.bbbb", "instance_id": "2"},
+            ]
+        )
+
+        with patch("src.tasks.load_dataset", return_value=fake_ds):
+            tasks = load_tasks("pallets/jinja", n=1)
+
+        self.assertEqual([task["instance_id"] for task in tasks], ["1"])
+
+    def test_load_tasks_reuses_the_scan_across_different_n(self) -> None:
+        fake_ds = Dataset.from_list(
+            [
+                {"repo": "swesmith/pallets__jinja.aaaa", "instance_id": "1"},
+                {"repo": "swesmith/fastapi__fastapi.bbbb", "instance_id": "2"},
+                {"repo": "swesmith/pallets__jinja.cccc", "instance_id": "3"},
+            ]
+        )
+
+        with (
+            patch("src.tasks.load_dataset", return_value=fake_ds) as mock_load,
+            patch("src.tasks.pc.is_in", wraps=pc.is_in) as mock_is_in,
+        ):
+            few = load_tasks("pallets/jinja", n=1)
+            more = load_tasks("pallets/jinja", n=10)
+
+        self.assertEqual([task["instance_id"] for task in few], ["1"])
+        self.assertEqual([task["instance_id"] for task in more], ["1", "3"])
+        mock_load.assert_called_once()
+        mock_is_in.assert_called_once()
+
     def test_load_tasks_rejects_malformed_repo_names(self) -> None:
         with patch("src.tasks.load_dataset") as mock_load_dataset:
             with self.assertRaisesRegex(
@@ -41,9 +108,11 @@ class LoadTasksTests(unittest.TestCase):
         mock_load_dataset.assert_not_called()
 
     def test_load_tasks_reports_unsupported_repos(self) -> None:
-        fake_rows = iter([{"repo": "swesmith/pallets__jinja.aaaa", "instance_id": "1"}])
+        fake_ds = Dataset.from_list(
+            [{"repo": "swesmith/pallets__jinja.aaaa", "instance_id": "1"}]
+        )
 
-        with patch("src.tasks.load_dataset", return_value=fake_rows):
+        with patch("src.tasks.load_dataset", return_value=fake_ds):
             with self.assertRaisesRegex(
                 ValueError,
                 "Repository 'fastapi/fastapi' has no tasks in SWE-bench/SWE-smith",
@@ -51,9 +120,20 @@ class LoadTasksTests(unittest.TestCase):
                 load_tasks("fastapi/fastapi")
 
 
-class ListSupportedReposTests(unittest.TestCase):
+class SplitTasksTests(unittest.TestCase):
+    def test_split_tasks_partitions_in_order(self) -> None:
+        tasks = [{"instance_id": str(i)} for i in range(10)]
+
+        train, val, test = split_tasks(tasks, train=0.5, val=0.2)
+
+        self.assertEqual(train, tasks[:5])
+        self.assertEqual(val, tasks[5:7])
+        self.assertEqual(test, tasks[7:])
+
+
+class ListSupportedReposTests(DatasetCacheTestCase):
     def test_list_supported_repos_returns_unique_sorted_values(self) -> None:
-        fake_rows = iter(
+        fake_ds = Dataset.from_list(
             [
                 {"repo": "swesmith/pallets__jinja.aaaa"},
                 {"repo": "swesmith/fastapi__fastapi.bbbb"},
@@ -61,20 +141,20 @@ class ListSupportedReposTests(unittest.TestCase):
             ]
         )
 
-        with patch("src.tasks.load_dataset", return_value=fake_rows):
+        with patch("src.tasks.load_dataset", return_value=fake_ds):
             repos = list_supported_repos()
 
         self.assertEqual(repos, ["fastapi/fastapi", "pallets/jinja"])
 
     def test_list_supported_repos_filters_matches(self) -> None:
-        fake_rows = iter(
+        fake_ds = Dataset.from_list(
             [
                 {"repo": "swesmith/pallets__jinja.aaaa"},
                 {"repo": "swesmith/fastapi__fastapi.bbbb"},
             ]
         )
 
-        with patch("src.tasks.load_dataset", return_value=fake_rows):
+        with patch("src.tasks.load_dataset", return_value=fake_ds):
             repos = list_supported_repos("fast")
 
         self.assertEqual(repos, ["fastapi/fastapi"])
@@ -87,6 +167,48 @@ class ExtractRepoNameTests(unittest.TestCase):
             "fastapi/fastapi",
         )
 
+    def test_extract_repo_name_handles_git_suffix_and_subpaths(self) -> None:
+        for url in (
+            "https://github.com/pallets/jinja.git",
+            "https://github.com/pallets/jinja/",
+            "https://github.com/pallets/jinja/tree/main/src",
+            "github.com/pallets/jinja",
+            "pallets/jinja",
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(_extract_repo_name(url), "pallets/jinja")
+
+    def test_extract_repo_name_passes_through_bare_names(self) -> None:
+        self.assertEqual(_extract_repo_name("fastapi"), "fastapi")
+
+
+class ResolveMaxConcurrentTests(unittest.TestCase):
+    def test_explicit_value_wins_over_env(self) -> None:
+        with patch.dict(os.environ, {"GSKILL_MAX_CONCURRENT": "2"}):
+            self.assertEqual(_resolve_max_concurrent(5), 5)
+
+    def test_env_var_is_used_when_unset(self) -> None:
+        with patch.dict(os.environ, {"GSKILL_MAX_CONCURRENT": "3"}):
+            self.assertEqual(_resolve_max_concurrent(None), 3)
+
+    def test_non_integer_env_var_names_the_variable(self) -> None:
+        with (
+            patch.dict(os.environ, {"GSKILL_MAX_CONCURRENT": "lots"}),
+            self.assertRaisesRegex(ValueError, "GSKILL_MAX_CONCURRENT"),
+        ):
+            _resolve_max_concurrent(None)
+
+    def test_default_is_capped_at_eight(self) -> None:
+        with (
+            patch.dict(os.environ, {}, clear=True),
+            patch("src.pipeline.os.cpu_count", return_value=64),
+        ):
+            self.assertEqual(_resolve_max_concurrent(None), 8)
+
+    def test_rejects_non_positive_values(self) -> None:
+        with self.assertRaisesRegex(ValueError, "at least 1"):
+            _resolve_max_concurrent(0)
+
 
 if __name__ == "__main__":
     unittest.main()